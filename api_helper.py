@@ -10,8 +10,13 @@
 
 import os
 import sys
+import json
+import time
+import base64
+import orjson
 import requests
-from tabulate import tabulate
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 API_URL = "http://127.0.0.1:8000"
 # API_URL = os.getenv("API_URL", "http://127.0.0.1:8000")
@@ -24,37 +29,81 @@ PASSWORD = "123456"
 # Token cache (so we don't log in every time)
 TOKEN_FILE = ".apitoken"
 
+# Re-login this many seconds before the token actually expires (clock skew)
+TOKEN_EXPIRY_SKEW = 30
+
+# In-process token cache; TOKEN_FILE is only re-read when its mtime changes
+_TOKEN_CACHE = {"token": None, "exp": 0, "mtime": 0}
+
+# Shared HTTP session (keep-alive connection reuse + retry on gateway errors).
+# Login and API calls go to the same host, so they share one TCP/TLS socket.
+SESSION = requests.Session()
+SESSION.headers["Content-Type"] = "application/json"
+SESSION.headers["Connection"] = "keep-alive"
+retries = Retry(
+    total=2,
+    backoff_factor=0.3,
+    status_forcelist=(502, 503, 504),
+    raise_on_status=False,  # hand back the last 5xx so callers print it
+)
+adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retries)  # single host
+SESSION.mount("https://", adapter)
+SESSION.mount("http://", adapter)
+
 
 # -------------------- Auth Helpers --------------------
+def _jwt_exp(token):
+    """Return the `exp` claim of a JWT (decoded locally, signature not checked)."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)  # restore base64 padding
+        return json.loads(base64.urlsafe_b64decode(payload))["exp"]
+    except (IndexError, KeyError, TypeError, ValueError):
+        return 0
+
+
+def _read_token_file():
+    """Refresh _TOKEN_CACHE from TOKEN_FILE if the file changed since last read."""
+    try:
+        mtime = os.stat(TOKEN_FILE).st_mtime
+        if mtime == _TOKEN_CACHE["mtime"]:
+            return
+        fd = os.open(TOKEN_FILE, os.O_RDONLY)
+    except FileNotFoundError:
+        return
+
+    try:
+        token = os.read(fd, 4096).strip().decode() or None
+    finally:
+        os.close(fd)
+    _TOKEN_CACHE.update(token=token, exp=_jwt_exp(token) if token else 0, mtime=mtime)
+
+
 def get_token():
     """Get a valid access token (reuse cached one if possible)."""
-    token = None
-
-    # Check if token is cached
-    if os.path.exists(TOKEN_FILE):
-        with open(TOKEN_FILE, "r") as f:
-            token = f.read().strip()
+    # Check in-process cache (refreshed from the token file if it changed)
+    _read_token_file()
+    token = _TOKEN_CACHE["token"]
 
-    # Validate cached token
+    # Validate cached token locally via its `exp` claim (no probe request)
     if token:
-        r = requests.get(f"{API_URL}/api/favorites/", headers={"Authorization": f"Bearer {token}"})
-        if r.status_code == 200:
+        if time.time() < _TOKEN_CACHE["exp"] - TOKEN_EXPIRY_SKEW:
             return token  # still valid
-        else:
-            print("⚠️  Cached token expired, logging in again...")
+        print("⚠️  Cached token expired, logging in again...")
 
     # Login to get a new token
-    r = requests.post(
+    r = SESSION.post(
         f"{API_URL}/auth/token/",
         json={"username": USERNAME, "password": PASSWORD},
     )
     if r.status_code != 200:
         sys.exit(f"❌ Failed to authenticate: {r.text}")
-    token = r.json()["access"]
+    token = orjson.loads(r.content)["access"]
 
     # Save token to file
     with open(TOKEN_FILE, "w") as f:
         f.write(token)
+    _TOKEN_CACHE.update(token=token, exp=_jwt_exp(token), mtime=os.stat(TOKEN_FILE).st_mtime)
 
     print("✅ Logged in, got new access token.")
     return token
@@ -65,23 +114,37 @@ def call_api(method, endpoint, **kwargs):
     token = get_token()
     headers = kwargs.pop("headers", {})
     headers["Authorization"] = f"Bearer {token}"
-    headers["Content-Type"] = "application/json"
 
     url = f"{API_URL}{endpoint}"
-    r = requests.request(method, url, headers=headers, **kwargs)
+    r = SESSION.request(method, url, headers=headers, **kwargs)
 
-    # Retry once if unauthorized
+    # Retry once if unauthorized (e.g. token revoked before `exp`)
     if r.status_code == 401:
-        if os.path.exists(TOKEN_FILE):
-            os.remove(TOKEN_FILE)
+        _TOKEN_CACHE.update(token=None, exp=0, mtime=0)
+        try:
+            os.unlink(TOKEN_FILE)
+        except FileNotFoundError:
+            pass
         token = get_token()
         headers["Authorization"] = f"Bearer {token}"
-        r = requests.request(method, url, headers=headers, **kwargs)
+        r = SESSION.request(method, url, headers=headers, **kwargs)
 
     if r.status_code >= 400:
         sys.exit(f"❌ API error {r.status_code}: {r.text}")
 
-    return r.json() if r.text else {}
+    return orjson.loads(r.content) if r.content else {}
+
+
+# -------------------- Output --------------------
+def _print_table(rows, headers):
+    """Print rows as left-aligned columns (a tiny stand-in for tabulate)."""
+    rows = [tuple(map(str, r)) for r in rows]
+    widths = [max(len(h), *(len(r[i]) for r in rows)) for i, h in enumerate(headers)]
+    fmt = "  ".join(f"{{:<{w}}}" for w in widths)
+    print(fmt.format(*headers))
+    print(fmt.format(*("-" * w for w in widths)))
+    for r in rows:
+        print(fmt.format(*r))
 
 
 # -------------------- Favorites --------------------
@@ -91,7 +154,7 @@ def favorites_list():
         print("📭 No favorites found.")
         return
     table = [(f["id"], f["tmdb_id"], f["title"]) for f in data]
-    print(tabulate(table, headers=["ID", "TMDb ID", "Title"]))
+    _print_table(table, headers=["ID", "TMDb ID", "Title"])
 
 
 def favorites_add(tmdb_id):
@@ -114,7 +177,7 @@ def movies_trending():
         print("📭 No trending movies found.")
         return
     table = [(m["id"], m["title"], m.get("release_date", "N/A")) for m in results[:10]]
-    print(tabulate(table, headers=["ID", "Title", "Release Date"]))
+    _print_table(table, headers=["ID", "Title", "Release Date"])
 
 
 def movies_recommendations(tmdb_id):
@@ -124,7 +187,7 @@ def movies_recommendations(tmdb_id):
         print("📭 No recommendations found.")
         return
     table = [(m["id"], m["title"], m.get("release_date", "N/A")) for m in results[:10]]
-    print(tabulate(table, headers=["ID", "Title", "Release Date"]))
+    _print_table(table, headers=["ID", "Title", "Release Date"])
 
 
 # -------------------- CLI Entrypoint --------------------
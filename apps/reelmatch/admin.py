@@ -28,3 +28,6 @@ class FavoriteMovieAdmin(admin.ModelAdmin):
 
     # Prevent manual edits to added_at in admin detail view
     readonly_fields = ("added_at",)
+
+    # Join the user in the changelist query (list_display shows it)
+    list_select_related = ("user",)
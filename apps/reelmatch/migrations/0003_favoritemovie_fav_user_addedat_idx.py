@@ -0,0 +1,19 @@
+# Generated by Django 4.2.7 on 2026-10-15 09:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('reelmatch', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='favoritemovie',
+            index=models.Index(fields=['user', '-added_at'], name='fav_user_addedat_idx'),
+        ),
+    ]
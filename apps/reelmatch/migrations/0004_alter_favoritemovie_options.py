@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-15 10:03
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reelmatch', '0003_favoritemovie_fav_user_addedat_idx'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='favoritemovie',
+            options={},
+        ),
+    ]
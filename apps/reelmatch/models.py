@@ -4,6 +4,22 @@ from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+
+class FavoriteMovieQuerySet(models.QuerySet):
+    # Columns FavoriteMovieSerializer renders
+    LIST_FIELDS = ("id", "tmdb_id", "title", "poster_path", "overview", "added_at")
+
+    def for_list(self, user):
+        """
+        A user's favorites, loading only the serialized columns.
+        FK columns are always added to `.only()` (derived from the model, so
+        new relations are picked up automatically): a deferred FK makes
+        `select_related`/`prefetch_related` refetch each row to match it.
+        """
+        fk_fields = [f.name for f in self.model._meta.concrete_fields if f.is_relation]
+        return self.filter(user=user).only(*self.LIST_FIELDS, *fk_fields)
+
+
 class FavoriteMovie(models.Model):
     user = models.ForeignKey(
         User,
@@ -27,13 +43,17 @@ class FavoriteMovie(models.Model):
         default="manual",
     )
 
+    objects = FavoriteMovieQuerySet.as_manager()
+
     class Meta:
         constraints = [
             models.UniqueConstraint(fields=["user", "tmdb_id"], name="unique_user_favorite")
         ]
-        ordering = ("-added_at",)
         indexes = [
             models.Index(fields=["user", "tmdb_id"]),
+            # Per-user favorites list, newest first (no separate sort step)
+            models.Index(fields=["user", "-added_at"], name="fav_user_addedat_idx"),
+            # Global newest-first ordering (admin changelist)
             models.Index(fields=["added_at"]),
         ]
 
@@ -22,6 +22,7 @@ class FavoriteMovieCreateSerializer(serializers.ModelSerializer):
     the response will also include the generated ID.
     """
     tmdb_id = serializers.IntegerField(
+        min_value=1,
         help_text="TMDb movie ID (must be positive integer)."
     )
 
@@ -30,7 +31,15 @@ class FavoriteMovieCreateSerializer(serializers.ModelSerializer):
         fields = ["id", "tmdb_id"]  # ✅ include id in response
         read_only_fields = ["id"]
 
-    def validate_tmdb_id(self, value):
-        if value <= 0:
-            raise serializers.ValidationError("TMDb ID must be a positive integer.")
-        return value
+
+class FavoriteMovieBulkCreateSerializer(serializers.Serializer):
+    """
+    Serializer for bulk-importing favorite movies.
+    Clients send a list of TMDb movie IDs; duplicates are skipped.
+    """
+    tmdb_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=1000,
+        help_text="TMDb movie IDs to import (max 1000).",
+    )
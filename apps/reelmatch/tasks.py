@@ -1,17 +1,65 @@
 # reelmatch/tasks.py
 """
-Celery tasks to pre-warm TMDb caches.
+Celery tasks to pre-warm TMDb caches and fill in TMDb metadata.
 This ensures the first API request is fast and reduces load on TMDb.
 """
 
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from celery import shared_task
-from django.core.cache import cache
-from .tmdb import get_trending, get_movie_details
+from django.conf import settings
+from django.db import connection
+from .models import FavoriteMovie
+from .tmdb import CACHE_TIMEOUT, get_trending, get_movie_details, refresh_cached
 
 logger = logging.getLogger(__name__)
 
-CACHE_PREFIX = "tmdb"
+# Max concurrent TMDb requests per warmer run (keeps us under TMDb rate limits)
+WARM_MAX_WORKERS = 8
+
+# memory:// means no broker: nothing consumes .delay() (the Render deploy
+# runs only `web`), so background work has to run in this process instead.
+CELERY_AVAILABLE = not settings.CELERY_BROKER_URL.startswith("memory://")
+# LocMem is per process: what a worker caches there never reaches web
+SHARED_CACHE = not settings.CACHES["default"]["BACKEND"].endswith("LocMemCache")
+
+
+def run_in_background(task, *args, use_celery=None) -> bool:
+    """
+    Queue `task` on Celery, or run it on a daemon thread in this process
+    when no worker is available (`use_celery` defaults to CELERY_AVAILABLE).
+    Never raises; returns False if the task could not be started.
+    """
+    if CELERY_AVAILABLE if use_celery is None else use_celery:
+        try:
+            task.delay(*args)
+        except Exception:
+            logger.exception("Failed to queue %s", task.name)
+            return False
+        return True
+
+    threading.Thread(target=_run_in_thread, args=(task, args), daemon=True).start()
+    return True
+
+
+def _run_in_thread(task, args) -> None:
+    """Thread target for run_in_background: run the task body directly."""
+    try:
+        task(*args)
+    except Exception:
+        logger.exception("Background %s failed", task.name)
+    finally:
+        connection.close()  # threads get no request_finished cleanup
+
+
+def _safe_movie_details(mid: int):
+    """Fetch details for one movie; a failure must not abort the whole batch."""
+    try:
+        return get_movie_details(mid)
+    except Exception:
+        logger.exception("Failed to warm movie details (id=%s)", mid)
+        return None
 
 
 @shared_task(
@@ -23,13 +71,11 @@ CACHE_PREFIX = "tmdb"
 def warm_trending_cache(self, pages: int = 2):
     """
     Pre-warm the cache for trending movies.
-    By default warms the first `pages` of results.
+    By default warms the first `pages` of results, under the keys
+    TrendingMoviesAPIView reads (the same work as refresh_trending).
     """
-    for p in range(1, pages + 1):
-        data = get_trending(media_type="movie", time_window="day")  # you can tune params
-        cache_key = f"{CACHE_PREFIX}:trending:page:{p}:v1"
-        cache.set(cache_key, data, timeout=60 * 30)  # 30 min
-        logger.info("Warmed trending cache (page=%s)", p)
+    _refresh_trending_pages(pages)
+    logger.info("Warmed trending cache (pages=%s)", pages)
 
 
 @shared_task(
@@ -42,9 +88,103 @@ def warm_movie_details(self, movie_ids: list[int]):
     """
     Pre-warm the cache for a list of specific movies.
     Useful for popular or featured titles.
+    Details are fetched concurrently (bounded by WARM_MAX_WORKERS);
+    get_movie_details caches each one under the key it reads.
+    """
+    with ThreadPoolExecutor(max_workers=WARM_MAX_WORKERS) as executor:
+        results = list(executor.map(_safe_movie_details, movie_ids))
+
+    warmed = sum(1 for details in results if details is not None and "error" not in details)
+    logger.info("Warmed movie details cache (count=%s)", warmed)
+
+
+@shared_task(ignore_result=True)
+def refresh_trending(pages: int = 5):
+    """
+    Re-fetch the trending pages served by TrendingMoviesAPIView.
+    Scheduled by Celery Beat (CELERY_BEAT_SCHEDULE) just under the cache TTL,
+    so request-path lookups are cache hits. Only scheduled when REDIS_URL
+    gives web and the worker a shared cache.
+    """
+    _refresh_trending_pages(pages)
+    logger.info("Refreshed trending cache (pages=%s)", pages)
+
+
+def _refresh_trending_pages(pages: int) -> None:
+    """Re-fetch trending pages 1..pages concurrently (bounded by WARM_MAX_WORKERS)."""
+    def fetch(p):
+        return get_trending(page=p, force_refresh=True)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(pages, WARM_MAX_WORKERS))) as executor:
+        list(executor.map(fetch, range(1, pages + 1)))
+
+
+@shared_task(ignore_result=True)
+def refresh_tmdb_path(path: str, params: dict | None, cache_key: str,
+                      normalize: str | None = None, ttl: int | None = None):
     """
-    for mid in movie_ids:
-        details = get_movie_details(mid)
-        cache_key = f"{CACHE_PREFIX}:movie:{mid}:details:v1"
-        cache.set(cache_key, details, timeout=60 * 60 * 24)  # 24h
-        logger.info("Warmed movie details cache (id=%s)", mid)
+    Refresh a stale TMDb cache entry in the background.
+    Scheduled by the service layer when it serves stale data.
+    """
+    refresh_cached(path, params, cache_key, normalize, ttl or CACHE_TIMEOUT)
+    logger.info("Refreshed TMDb cache (key=%s)", cache_key)
+
+
+@shared_task(
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    retry_kwargs={"max_retries": 3},
+)
+def hydrate_favorite(self, favorite_id: int):
+    """
+    Fill a saved favorite's title/poster/overview from TMDb.
+    Scheduled by FavoriteMovieViewSet.perform_create after the row commits.
+    """
+    favorite = FavoriteMovie.objects.filter(pk=favorite_id).only("id", "tmdb_id").first()
+    if favorite is None:
+        return  # deleted before we ran
+
+    details = get_movie_details(favorite.tmdb_id)
+    if "error" in details:
+        if details["error"] in ("network_error", "rate_limited", "too_many_inflight"):
+            raise self.retry()
+        logger.warning("Could not hydrate favorite %s: %s", favorite_id, details["error"])
+        return
+
+    FavoriteMovie.objects.filter(pk=favorite_id).update(**_favorite_fields(favorite.tmdb_id, details))
+    logger.info("Hydrated favorite (id=%s, tmdb_id=%s)", favorite_id, favorite.tmdb_id)
+
+
+@shared_task(ignore_result=True)
+def hydrate_favorites(user_id: int, tmdb_ids: list[int]):
+    """
+    Fill in TMDb metadata for bulk-imported favorites.
+    bulk_create(ignore_conflicts=True) sets no PKs, so rows are looked up by
+    (user, tmdb_id); only rows still holding the placeholder title are
+    touched. Details are fetched concurrently (bounded by WARM_MAX_WORKERS);
+    rows whose fetch fails keep their placeholder.
+    """
+    rows = list(
+        FavoriteMovie.objects.filter(user_id=user_id, tmdb_id__in=tmdb_ids, title__startswith="tmdb:")
+        .values_list("id", "tmdb_id")
+    )
+    with ThreadPoolExecutor(max_workers=WARM_MAX_WORKERS) as executor:
+        results = list(executor.map(_safe_movie_details, [tmdb_id for _, tmdb_id in rows]))
+
+    updates = [
+        FavoriteMovie(pk=pk, **_favorite_fields(tmdb_id, details))
+        for (pk, tmdb_id), details in zip(rows, results)
+        if details is not None and "error" not in details
+    ]
+    FavoriteMovie.objects.bulk_update(updates, ["title", "poster_path", "overview"], batch_size=500)
+    logger.info("Hydrated imported favorites (user=%s, %s/%s)", user_id, len(updates), len(rows))
+
+
+def _favorite_fields(tmdb_id: int, details: dict) -> dict:
+    """FavoriteMovie column values from a movie DTO."""
+    return {
+        "title": details.get("title") or f"tmdb:{tmdb_id}",
+        "poster_path": details.get("poster") or "",
+        "overview": details.get("overview") or "",
+    }
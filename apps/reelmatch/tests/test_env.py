@@ -0,0 +1,18 @@
+# apps/reelmatch/tests/test_env.py
+import environ
+from django.conf import settings
+
+ENV_EXAMPLE = settings.BASE_DIR / ".env.example"
+
+
+def test_env_example_values_parse_cleanly(monkeypatch):
+    monkeypatch.setattr(environ.Env, "ENVIRON", {})
+    environ.Env.read_env(ENV_EXAMPLE)
+    env = environ.Env()
+
+    assert env("LOG_LEVEL") == "INFO"
+    assert env("REDIS_URL") == "redis://localhost:6379/1"
+    assert env.int("CONN_MAX_AGE") == 60
+    assert env.int("JWT_ACCESS_MINUTES") == 30
+    assert env.int("JWT_REFRESH_DAYS") == 7
+    assert env.list("DJANGO_ALLOWED_HOSTS") == ["localhost", "127.0.0.1"]
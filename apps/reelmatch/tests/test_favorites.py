@@ -1,6 +1,10 @@
 # tests/test_favorites.py
 import pytest
 
+import apps.reelmatch.tasks as tasks_mod
+import apps.reelmatch.views as views_mod
+from apps.reelmatch.models import FavoriteMovie
+
 
 @pytest.mark.django_db
 def test_favorites_crud(auth_client):
@@ -37,3 +41,105 @@ def test_favorites_crud(auth_client):
     data = resp.json()
     assert data["count"] == 0
     assert data["results"] == []
+
+
+@pytest.mark.django_db
+def test_favorites_bulk_import(auth_client):
+    client = auth_client
+
+    # 1. Existing favorite is skipped by the import
+    resp = client.post("/api/favorites/", {"tmdb_id": 550}, format="json")
+    assert resp.status_code in (200, 201)
+
+    # 2. Bulk import (duplicates in the payload are collapsed)
+    resp = client.post("/api/favorites/bulk/", {"tmdb_ids": [550, 603, 680, 603]}, format="json")
+    assert resp.status_code == 201
+    assert resp.json()["created"] == 2
+
+    # 3. List contains all three favorites
+    resp = client.get("/api/favorites/")
+    data = resp.json()
+    assert data["count"] == 3
+    assert {f["tmdb_id"] for f in data["results"]} == {550, 603, 680}
+
+    # 4. Invalid IDs are rejected
+    resp = client.post("/api/favorites/bulk/", {"tmdb_ids": [0]}, format="json")
+    assert resp.status_code == 400
+
+
+@pytest.mark.django_db
+def test_favorites_for_list_keeps_fk_columns(create_user):
+    user = create_user()
+    FavoriteMovie.objects.create(user=user, tmdb_id=550, title="Fight Club")
+
+    fav = FavoriteMovie.objects.for_list(user).get()
+
+    # FK ids and serialized columns are loaded; unused ones stay deferred
+    deferred = fav.get_deferred_fields()
+    assert "user_id" not in deferred
+    assert "title" not in deferred
+    assert "source" in deferred
+
+
+@pytest.mark.django_db
+def test_favorite_hydrated_after_commit(auth_client, monkeypatch, django_capture_on_commit_callbacks):
+    scheduled = []
+    monkeypatch.setattr(views_mod, "run_in_background", lambda task, *args: scheduled.append((task, args)))
+    monkeypatch.setattr(tasks_mod, "get_movie_details", lambda mid: {
+        "id": mid, "title": "Fight Club", "poster": "/fc.jpg", "overview": "Mocked"
+    })
+
+    with django_capture_on_commit_callbacks(execute=True):
+        resp = auth_client.post("/api/favorites/", {"tmdb_id": 550}, format="json")
+    assert resp.status_code == 201
+    fav_id = resp.json()["id"]
+    assert scheduled == [(tasks_mod.hydrate_favorite, (fav_id,))]
+
+    # Run the scheduled task as a worker would
+    task, args = scheduled[0]
+    task(*args)
+
+    fav = FavoriteMovie.objects.get(pk=fav_id)
+    assert (fav.title, fav.poster_path, fav.overview) == ("Fight Club", "/fc.jpg", "Mocked")
+
+
+@pytest.mark.django_db
+def test_favorite_create_survives_broker_failure(auth_client, monkeypatch, django_capture_on_commit_callbacks):
+    def unreachable(*args):
+        raise ConnectionError("broker down")
+
+    monkeypatch.setattr(tasks_mod, "CELERY_AVAILABLE", True)
+    monkeypatch.setattr(tasks_mod.hydrate_favorite, "delay", unreachable)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        resp = auth_client.post("/api/favorites/", {"tmdb_id": 550}, format="json")
+    assert resp.status_code == 201
+
+    # Row is kept with its placeholder title
+    assert FavoriteMovie.objects.get(pk=resp.json()["id"]).title == "tmdb:550"
+
+
+@pytest.mark.django_db
+def test_bulk_import_hydrated_after_commit(auth_client, django_user_model, monkeypatch,
+                                           django_capture_on_commit_callbacks):
+    scheduled = []
+    monkeypatch.setattr(views_mod, "run_in_background", lambda task, *args: scheduled.append((task, args)))
+    monkeypatch.setattr(tasks_mod, "get_movie_details", lambda mid: (
+        {"error": "http_error", "status_code": 404} if mid == 680
+        else {"id": mid, "title": f"Movie {mid}", "poster": "/p.jpg", "overview": "Mocked"}
+    ))
+    user = django_user_model.objects.get(username="king")  # auth_client's user
+    FavoriteMovie.objects.create(user=user, tmdb_id=550, title="Kept")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        resp = auth_client.post("/api/favorites/bulk/", {"tmdb_ids": [550, 603, 680]}, format="json")
+    assert resp.status_code == 201
+    assert len(scheduled) == 1
+
+    # Run the scheduled task as a worker would
+    task, args = scheduled[0]
+    assert task is tasks_mod.hydrate_favorites
+    task(*args)
+
+    titles = dict(FavoriteMovie.objects.values_list("tmdb_id", "title"))
+    assert titles == {550: "Kept", 603: "Movie 603", 680: "tmdb:680"}
@@ -40,3 +40,40 @@ def test_movie_details(api_client, movie_id):
     assert "id" in data
     assert data["id"] == movie_id
     assert "title" in data
+
+
+@pytest.mark.django_db
+def test_trending_batch(api_client, monkeypatch):
+    """
+    Batch trending endpoint should return each requested page once,
+    keyed by page number.
+    """
+    import apps.reelmatch.views as views_mod
+
+    requested = []
+
+    def fake_pages(pages):
+        requested.append(list(pages))
+        return {p: {"page": p, "total_pages": 10, "results": []} for p in pages}
+
+    monkeypatch.setattr(views_mod, "get_trending_pages", fake_pages)
+
+    resp = api_client.get("/movies/trending/batch/?pages=1,2,2,3")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert set(data["pages"]) == {"1", "2", "3"}
+    assert data["pages"]["2"]["page"] == 2
+    assert requested == [[1, 2, 3]]
+    assert "public" in resp["Cache-Control"]
+
+
+@pytest.mark.parametrize("pages", ["", "0", "a,b", "1,2,3,4,5,6"])
+@pytest.mark.django_db
+def test_trending_batch_invalid_pages(api_client, pages):
+    """
+    Batch trending endpoint should reject missing, non-positive,
+    non-numeric or too many pages.
+    """
+    resp = api_client.get(f"/movies/trending/batch/?pages={pages}")
+    assert resp.status_code == 400
+    assert "public" not in resp.get("Cache-Control", "")
@@ -0,0 +1,80 @@
+# apps/reelmatch/tests/test_throttles.py
+from types import SimpleNamespace
+
+import fakeredis
+import pytest
+import redis
+
+from apps.reelmatch import throttles
+from apps.reelmatch.throttles import TMDBConcurrencyLimiter
+
+KEY = "test:inflight"
+
+
+@pytest.fixture
+def redis_conn(monkeypatch):
+    """Back TMDBConcurrencyLimiter with an in-memory Redis (runs the real Lua script)."""
+    conn = fakeredis.FakeStrictRedis()
+    monkeypatch.setattr(TMDBConcurrencyLimiter, "_connection", lambda self: conn)
+    return conn
+
+
+def test_acquires_up_to_max_inflight_then_refuses(redis_conn):
+    limiter = TMDBConcurrencyLimiter(KEY, max_inflight=2)
+
+    with limiter.slot() as first, limiter.slot() as second, limiter.slot() as third:
+        assert (first, second, third) == (True, True, False)
+        assert redis_conn.zcard(KEY) == 2
+
+    # All slots released on exit
+    assert redis_conn.zcard(KEY) == 0
+    with limiter.slot() as acquired:
+        assert acquired is True
+
+
+def test_releases_slot_on_exception(redis_conn):
+    limiter = TMDBConcurrencyLimiter(KEY, max_inflight=1)
+
+    with pytest.raises(RuntimeError):
+        with limiter.slot():
+            raise RuntimeError("TMDb call failed")
+
+    assert redis_conn.zcard(KEY) == 0
+    with limiter.slot() as acquired:
+        assert acquired is True
+
+
+def test_leaked_slot_expires_after_timeout(redis_conn, monkeypatch):
+    clock = SimpleNamespace(now=1_000_000.0)
+    monkeypatch.setattr(throttles, "time", SimpleNamespace(time=lambda: clock.now))
+    limiter = TMDBConcurrencyLimiter(KEY, max_inflight=1, timeout=60)
+
+    leaked = limiter.slot()
+    assert leaked.__enter__() is True  # never exited, e.g. the worker was killed
+
+    with limiter.slot() as acquired:
+        assert acquired is False
+
+    clock.now += 61
+    with limiter.slot() as acquired:
+        assert acquired is True
+
+
+def test_allows_calls_without_django_redis(settings):
+    settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    limiter = TMDBConcurrencyLimiter(KEY, max_inflight=1)
+
+    assert limiter._connection() is None
+    with limiter.slot() as first, limiter.slot() as second:
+        assert (first, second) == (True, True)
+
+
+def test_allows_calls_when_redis_errors(redis_conn, monkeypatch):
+    def unavailable(*args, **kwargs):
+        raise redis.ConnectionError("redis down")
+
+    monkeypatch.setattr(redis_conn, "eval", unavailable)
+    limiter = TMDBConcurrencyLimiter(KEY, max_inflight=1)
+
+    with limiter.slot() as acquired:
+        assert acquired is True
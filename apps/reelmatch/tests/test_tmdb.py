@@ -0,0 +1,255 @@
+# apps/reelmatch/tests/test_tmdb.py
+import threading
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from django.core.cache import cache
+
+import apps.reelmatch.tasks as tasks_mod
+import apps.reelmatch.tmdb as tmdb
+
+PATH = "/movie/550"
+KEY = "tmdb:movie:550:details"
+RAW = {"id": 550, "title": "Fight Club", "poster_path": "/fc.jpg", "overview": "Mocked"}
+GET_TRENDING = tmdb.get_trending  # conftest's autouse mock_tmdb replaces it per test
+
+
+@pytest.fixture
+def tmdb_api(monkeypatch, settings):
+    """
+    Route tmdb.SESSION through an httpx.MockTransport, with a fresh LocMemCache.
+    Tests may replace `api.handler`; every request is recorded in `api.calls`.
+    """
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "tmdb-tests",
+        }
+    }
+    cache.clear()
+    monkeypatch.setattr(tmdb, "TMDB_API_KEY", "test-key")
+
+    api = SimpleNamespace(
+        calls=[],
+        handler=lambda request: httpx.Response(200, json=RAW, headers={"ETag": '"v2"'}),
+    )
+
+    def transport(request):
+        api.calls.append(request)
+        return api.handler(request)
+
+    monkeypatch.setattr(tmdb, "SESSION", httpx.Client(transport=httpx.MockTransport(transport)))
+    yield api
+    cache.clear()
+
+
+def _get(**kwargs):
+    return tmdb._tmdb_get(PATH, cache_key=KEY, normalize="movie", **kwargs)
+
+
+def _seed(fresh_for, etag='"v1"', key=KEY):
+    """Cache an entry for `key` that is fresh for `fresh_for` seconds (negative = stale)."""
+    now = time.time()
+    cache.set(key, {
+        "data": {"id": 550, "title": "Cached"},
+        "etag": etag,
+        "fresh_until": now + fresh_for,
+        "stale_until": now + 300,
+    }, 300)
+
+
+def test_cold_miss_caches_envelope_then_serves_fresh(tmdb_api):
+    data = _get()
+    assert data["title"] == "Fight Club"
+    assert data["poster"] == "/fc.jpg"  # normalized before caching
+
+    entry = cache.get(KEY)
+    assert entry["data"] == data
+    assert entry["etag"] == '"v2"'
+    assert entry["fresh_until"] > time.time()
+
+    # Fresh hit: no second request
+    assert _get() == data
+    assert len(tmdb_api.calls) == 1
+
+
+@pytest.mark.parametrize("celery, shared_cache, queued", [
+    (True, True, True),
+    (True, False, False),   # worker would refresh its own LocMem
+    (False, True, False),   # memory:// broker: nothing consumes the queue
+])
+def test_stale_entry_served_and_refresh_scheduled(tmdb_api, monkeypatch, celery, shared_cache, queued):
+    monkeypatch.setattr(tasks_mod, "CELERY_AVAILABLE", celery)
+    monkeypatch.setattr(tasks_mod, "SHARED_CACHE", shared_cache)
+    scheduled = []
+    monkeypatch.setattr(
+        tasks_mod, "run_in_background",
+        lambda task, *args, use_celery=None: scheduled.append((task, args, use_celery)) or True,
+    )
+    _seed(fresh_for=-1)
+
+    assert _get()["title"] == "Cached"
+    assert tmdb_api.calls == []
+    assert scheduled == [
+        (tasks_mod.refresh_tmdb_path, (PATH, None, KEY, "movie", tmdb.CACHE_TIMEOUT), queued)
+    ]
+
+    # The refresh lock stops a second read from scheduling again
+    assert _get()["title"] == "Cached"
+    assert len(scheduled) == 1
+
+
+def test_stale_refresh_runs_in_process_without_worker(tmdb_api, monkeypatch):
+    monkeypatch.setattr(tasks_mod, "CELERY_AVAILABLE", False)
+    _seed(fresh_for=-1)
+
+    assert _get()["title"] == "Cached"
+
+    deadline = time.monotonic() + 2
+    while cache.get(KEY)["data"]["title"] != "Fight Club" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cache.get(KEY)["data"]["title"] == "Fight Club"
+    assert cache.get(f"{KEY}:lock") is None
+    assert tmdb_api.calls[0].headers["If-None-Match"] == '"v1"'
+
+
+def test_not_modified_extends_entry_without_reparse(tmdb_api):
+    tmdb_api.handler = lambda request: httpx.Response(304)
+    _seed(fresh_for=-1)
+
+    data = _get(force=True)
+
+    assert data == {"id": 550, "title": "Cached"}
+    assert tmdb_api.calls[0].headers["If-None-Match"] == '"v1"'
+    entry = cache.get(KEY)
+    assert entry["data"] == data
+    assert entry["etag"] == '"v1"'
+    assert entry["fresh_until"] > time.time()
+
+
+def test_cold_miss_single_flight(tmdb_api):
+    release = threading.Event()
+
+    def slow(request):
+        release.wait(5)
+        return httpx.Response(200, json=RAW)
+
+    tmdb_api.handler = slow
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(_get())) for _ in range(5)]
+    for t in threads:
+        t.start()
+
+    deadline = time.monotonic() + 2
+    while not tmdb_api.calls and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.2)  # let the other callers reach the fill lock
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert len(tmdb_api.calls) == 1
+    assert [r["title"] for r in results] == ["Fight Club"] * 5
+
+
+def test_waiter_waits_while_fill_lock_is_held(tmdb_api):
+    cache.set(f"{KEY}:fill", "other-worker", 60)
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(_get()))
+    waiter.start()
+
+    time.sleep(0.3)
+    assert waiter.is_alive()
+    assert tmdb_api.calls == []
+
+    # The holder's fill lands: the waiter returns it without calling TMDb
+    _seed(fresh_for=60)
+    waiter.join(2)
+    assert results == [{"id": 550, "title": "Cached"}]
+    assert tmdb_api.calls == []
+
+
+def test_waiter_fetches_itself_when_lock_released_without_fill(tmdb_api):
+    cache.set(f"{KEY}:fill", "other-worker", 60)
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(_get()))
+    waiter.start()
+
+    time.sleep(0.1)
+    cache.delete(f"{KEY}:fill")  # holder's fetch failed
+    waiter.join(1)  # noticed on the next poll, not after a fixed wait
+    assert results[0]["title"] == "Fight Club"
+    assert len(tmdb_api.calls) == 1
+
+
+def test_waiter_gives_up_after_fill_wait_and_fetches(tmdb_api, monkeypatch):
+    monkeypatch.setattr(tmdb, "FILL_WAIT_SECONDS", 0.2)
+    cache.set(f"{KEY}:fill", "other-worker", 60)  # holder is stuck on a slow fetch
+
+    started = time.monotonic()
+    assert _get()["title"] == "Fight Club"
+    assert time.monotonic() - started < 1
+    assert len(tmdb_api.calls) == 1
+    assert cache.get(f"{KEY}:fill") == "other-worker"  # still the holder's lock
+
+
+def test_fill_lock_released_only_by_owner(tmdb_api):
+    _get()
+    assert cache.get(f"{KEY}:fill") is None
+
+    def lock_retaken(request):
+        # Our lock expired mid-fetch and another worker took it
+        cache.set(f"{KEY}:fill", "other-worker", 60)
+        return httpx.Response(200, json=RAW)
+
+    cache.clear()
+    tmdb_api.handler = lock_retaken
+    _get()
+    assert cache.get(f"{KEY}:fill") == "other-worker"
+
+
+def test_warm_trending_cache_fills_the_keys_the_view_reads(tmdb_api):
+    tasks_mod.warm_trending_cache(pages=2)
+
+    for page in (1, 2):
+        _, _, cache_key = tmdb._trending_request("movie", "week", page)
+        assert cache.get(cache_key) is not None
+    assert len(tmdb_api.calls) == 2
+
+
+def test_warm_movie_details_fills_the_keys_get_movie_details_reads(tmdb_api):
+    tasks_mod.warm_movie_details([550])
+
+    assert cache.get("tmdb:movie:550:details")["data"]["title"] == "Fight Club"
+    assert len(tmdb_api.calls) == 1
+
+
+def test_get_trending_pages_serves_cached_and_fetches_only_misses(tmdb_api, monkeypatch):
+    monkeypatch.setattr(tmdb, "get_trending", GET_TRENDING)
+    scheduled = []
+    monkeypatch.setattr(
+        tasks_mod, "run_in_background",
+        lambda task, *args, use_celery=None: scheduled.append((task, args)) or True,
+    )
+    tmdb_api.handler = lambda request: httpx.Response(200, json={"page": 3, "results": [RAW]})
+    (_, _, fresh_key), (stale_path, stale_params, stale_key), (_, _, missing_key) = (
+        tmdb._trending_request("movie", "week", page) for page in (1, 2, 3)
+    )
+    _seed(fresh_for=60, key=fresh_key)
+    _seed(fresh_for=-1, key=stale_key)
+
+    results = tmdb.get_trending_pages([1, 2, 3])
+
+    assert sorted(results) == [1, 2, 3]
+    assert results[1] == results[2] == {"id": 550, "title": "Cached"}
+    # Stale page is served as-is and refreshed in the background
+    assert scheduled == [
+        (tasks_mod.refresh_tmdb_path, (stale_path, stale_params, stale_key, "list", tmdb.CACHE_TIMEOUT))
+    ]
+    # Only the missing page goes to TMDb, and lands under the key the view reads
+    assert len(tmdb_api.calls) == 1
+    assert tmdb_api.calls[0].url.params["page"] == "3"
+    assert cache.get(missing_key)["data"] == results[3]
+    assert results[3]["results"][0]["title"] == "Fight Club"
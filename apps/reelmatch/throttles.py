@@ -1,6 +1,13 @@
 # reelmatch/throttles.py
+import time
+import uuid
+import logging
+from contextlib import contextmanager
+
 from rest_framework.throttling import SimpleRateThrottle
 
+logger = logging.getLogger(__name__)
+
 class TMDBRateThrottle(SimpleRateThrottle):
     """
     Custom throttle for endpoints that call the TMDb API.
@@ -23,3 +30,68 @@ class TMDBRateThrottle(SimpleRateThrottle):
             "scope": self.scope,
             "ident": ident
         }
+
+
+class TMDBConcurrencyLimiter:
+    """
+    Caps concurrent in-flight TMDb calls across all workers.
+    A rate throttle bounds requests per minute, but a cache expiry under
+    load can still send every worker to TMDb at once; this bounds that.
+
+    Uses a Redis sorted set (member = call id, score = start time). Calls
+    older than `timeout` seconds are treated as leaked and dropped. Without
+    a django-redis cache (or if Redis is unreachable) every call is allowed.
+    """
+    ACQUIRE_SCRIPT = """
+    local now = tonumber(ARGV[1])
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - tonumber(ARGV[3]))
+    if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[2]) then
+        redis.call('ZADD', KEYS[1], now, ARGV[4])
+        redis.call('EXPIRE', KEYS[1], ARGV[3])
+        return 1
+    end
+    return 0
+    """
+
+    def __init__(self, key: str, max_inflight: int, timeout: int = 60):
+        self.key = key
+        self.max_inflight = max_inflight
+        self.timeout = timeout
+
+    def _connection(self):
+        try:
+            from django_redis import get_redis_connection
+            return get_redis_connection("default")
+        except (ImportError, NotImplementedError):
+            return None  # cache backend is not Redis
+
+    @contextmanager
+    def slot(self):
+        """
+        Yield True if the call may proceed, False if the limit is reached.
+        The slot is released when the block exits.
+        """
+        conn = self._connection()
+        if conn is None:
+            yield True
+            return
+
+        token = uuid.uuid4().hex
+        try:
+            acquired = bool(conn.eval(
+                self.ACQUIRE_SCRIPT, 1, self.key,
+                time.time(), self.max_inflight, self.timeout, token,
+            ))
+        except Exception:
+            logger.warning("TMDb concurrency limiter unavailable, allowing call", exc_info=True)
+            yield True
+            return
+
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                try:
+                    conn.zrem(self.key, token)
+                except Exception:
+                    logger.warning("Failed to release TMDb concurrency slot", exc_info=True)
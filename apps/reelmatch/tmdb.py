@@ -2,9 +2,15 @@
 """
 TMDb service layer with:
 - Django caching (via django-redis in production) to avoid repeated API calls
-- Centralized session with retry/backoff for transient errors
+- Stale-while-revalidate: expired entries are served while a background
+  refresh (Celery, or a thread when no worker is configured) replaces them
+- Single-flight cache fills: on a cold miss only one worker calls TMDb
+- Conditional GETs (If-None-Match) so unchanged TMDb data comes back as 304
+- Centralized HTTP/2 client with retry/backoff for transient errors
 - Explicit handling of TMDb 429 (rate limit) responses
+- Cluster-wide cap on concurrent in-flight TMDb calls (Redis)
 - DTO normalizer to give the frontend a stable, compact schema
+  (applied before caching, so cache hits need no re-normalization)
 
 Design:
 - This layer ONLY talks to TMDb.
@@ -13,14 +19,18 @@ Design:
 """
 
 import os
+import time
+import uuid
 import logging
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterable, Optional
 
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+import httpx
+import orjson
 from django.core.cache import cache
 
+from .throttles import TMDBConcurrencyLimiter
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -30,54 +40,167 @@ TMDB_API_KEY = os.getenv("TMDB_API_KEY", "")
 TMDB_BASE = "https://api.themoviedb.org/3"
 DEFAULT_LANGUAGE = os.getenv("TMDB_LANGUAGE", "en-US")
 CACHE_TIMEOUT = int(os.getenv("TMDB_CACHE_SECONDS", 60))  # seconds
+DETAILS_CACHE_TIMEOUT = int(os.getenv("TMDB_DETAILS_CACHE_SECONDS", 60 * 60 * 24))  # rarely changes
+STALE_FACTOR = 4  # stale data is still served for STALE_FACTOR x the TTL
+REFRESH_LOCK_SECONDS = 30  # one background refresh per key at a time
+REQUEST_TIMEOUT = 10  # seconds, per TMDb request attempt
+RETRY_TOTAL = 3  # retries on connection errors / 5xx
+RETRY_BACKOFF = 0.6  # exponential backoff (0.6, 1.2, 2.4s)
+# Budget for one fetch: every attempt times out, plus the backoff sleeps
+FETCH_BUDGET_SECONDS = REQUEST_TIMEOUT * (RETRY_TOTAL + 1) + RETRY_BACKOFF * (2 ** RETRY_TOTAL - 1)
+# One worker fills a cold cache entry at a time; the lock outlives its fetch
+FILL_LOCK_SECONDS = int(FETCH_BUDGET_SECONDS) + 1
+# Other workers wait briefly for it (well inside gunicorn's 30s worker
+# timeout), then fetch themselves
+FILL_WAIT_SECONDS = 3
+FILL_POLL_INTERVAL = 0.05
+MAX_FETCH_WORKERS = 8  # concurrent TMDb requests for multi-page fetches
+MAX_INFLIGHT = int(os.getenv("TMDB_MAX_INFLIGHT", 20))  # across all workers
+
+INFLIGHT_LIMITER = TMDBConcurrencyLimiter("tmdb:inflight", max_inflight=MAX_INFLIGHT)
 
 # ---------------------------------------------------------------------------
-# HTTP Session with retry/backoff
+# HTTP/2 client with retry/backoff
 # ---------------------------------------------------------------------------
-SESSION = requests.Session()
-SESSION.headers.update({"Accept": "application/json"})
-retries = Retry(
-    total=3,                 # max retry attempts
-    backoff_factor=0.6,      # exponential backoff (0.6, 1.2, 2.4s)
-    status_forcelist=(500, 502, 503, 504),  # retry only on server errors
-    allowed_methods=frozenset(["GET", "POST"])
+class RetryTransport(httpx.HTTPTransport):
+    """
+    httpx transport that also retries server errors.
+    httpx's own `retries` only covers connection failures, so status-based
+    retries (what urllib3's Retry gave us) are handled here.
+    """
+
+    def __init__(self, total: int = 3, backoff_factor: float = 0.6,
+                 status_forcelist=(500, 502, 503, 504), **kwargs):
+        super().__init__(retries=total, **kwargs)
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.status_forcelist = frozenset(status_forcelist)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        for attempt in range(self.total + 1):
+            response = super().handle_request(request)
+            if response.status_code not in self.status_forcelist or attempt == self.total:
+                return response
+            response.close()
+            time.sleep(self.backoff_factor * (2 ** attempt))
+        return response
+
+
+# A single multiplexed HTTP/2 connection serves concurrent TMDb calls
+# (warmers, threads) instead of one TCP+TLS handshake per request.
+SESSION = httpx.Client(
+    transport=RetryTransport(
+        total=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=(500, 502, 503, 504),  # retry only on server errors
+        http2=True,
+        # Headroom for the HTTP/1.1 fallback when many threads fetch at once
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+    ),
+    timeout=REQUEST_TIMEOUT,
+    headers={"Accept": "application/json"},
+    # Static query params, merged into every request by httpx
+    params={"api_key": TMDB_API_KEY, "language": DEFAULT_LANGUAGE},
 )
-SESSION.mount("https://", HTTPAdapter(max_retries=retries))
-SESSION.mount("http://", HTTPAdapter(max_retries=retries))
 
 # ---------------------------------------------------------------------------
 # Low-level GET wrapper
 # ---------------------------------------------------------------------------
 def _tmdb_get(path: str, params: Optional[Dict[str, Any]] = None,
-              cache_key: Optional[str] = None, timeout: int = 10) -> Dict[str, Any]:
+              cache_key: Optional[str] = None, timeout: int = REQUEST_TIMEOUT,
+              force: bool = False, normalize: Optional[str] = None,
+              ttl: int = CACHE_TIMEOUT) -> Dict[str, Any]:
     """
     Perform a GET request to TMDb API.
-    - Adds API key & language
+    - API key & language come from SESSION.params
     - Uses retries/backoff for transient errors
     - Detects TMDb rate-limit (429)
-    - Optionally caches results in Redis
+    - Bounds concurrent upstream calls (INFLIGHT_LIMITER)
+    - Optionally caches results in Redis (stale-while-revalidate):
+      fresh entries are returned as-is; stale ones are returned immediately
+      and a background refresh is scheduled. `force` ignores freshness.
+      Entries are fresh for `ttl` seconds.
+    - Revalidates cached entries via ETag; a 304 just extends the entry
+    - Single-flight on cold misses: concurrent callers wait for one fetch
+    - Optionally normalizes the payload (NORMALIZERS[normalize]) before caching
 
     Returns: dict (payload or {"error": ..., "status_code": ...})
     """
     if not TMDB_API_KEY:
         return {"error": "TMDB_API_KEY not set", "status_code": None}
 
-    # Apply defaults
-    params = dict(params or {})
-    params.update({"api_key": TMDB_API_KEY, "language": DEFAULT_LANGUAGE})
-
     # Try cache first
-    if cache_key:
-        cached = cache.get(cache_key)
+    cached = cache.get(cache_key) if cache_key else None
+    if cached is not None and not force:
+        return _serve_cached(cached, path, params, cache_key, normalize, ttl)
+
+    if cached is not None or not cache_key:
+        return _fetch_and_cache(path, params, cache_key, timeout, normalize, ttl, cached)
+
+    # Cold miss: only the lock holder fetches; others wait for its result
+    fill_lock = f"{cache_key}:fill"
+    token = uuid.uuid4().hex
+    if not cache.add(fill_lock, token, timeout=FILL_LOCK_SECONDS):
+        cached = _wait_for_fill(cache_key, fill_lock)
         if cached is not None:
-            return cached
+            return cached["data"]
+        token = None  # no fill in time (holder failed or is slow); fetch ourselves
 
-    url = f"{TMDB_BASE}{path}"
     try:
-        resp = SESSION.get(url, params=params, timeout=timeout)
-    except requests.RequestException as exc:
-        logger.exception("TMDb network error: %s %s", url, exc)
-        return {"error": "network_error", "status_code": None, "detail": str(exc)}
+        return _fetch_and_cache(path, params, cache_key, timeout, normalize, ttl, None)
+    finally:
+        if token:
+            _release_fill_lock(fill_lock, token)
+
+
+def _wait_for_fill(cache_key: str, fill_lock: str) -> Optional[Dict[str, Any]]:
+    """
+    Poll the cache while another worker holds `fill_lock`.
+    Returns the filled entry, or None once the lock is gone without a fill
+    or FILL_WAIT_SECONDS have passed.
+    """
+    deadline = time.monotonic() + FILL_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(FILL_POLL_INTERVAL)
+        found = cache.get_many([cache_key, fill_lock])  # one round trip
+        if cache_key in found:
+            return found[cache_key]
+        if fill_lock not in found:
+            return None
+    return None
+
+
+def _release_fill_lock(fill_lock: str, token: str) -> None:
+    """
+    Delete the fill lock only if we still hold it: if our fetch outlived
+    the lock, another worker may have taken it since. (get + delete is not
+    atomic, but the gap is one round trip against FILL_LOCK_SECONDS.)
+    """
+    if cache.get(fill_lock) == token:
+        cache.delete(fill_lock)
+
+
+def _fetch_and_cache(path: str, params: Optional[Dict[str, Any]], cache_key: Optional[str],
+                     timeout: int, normalize: Optional[str], ttl: int,
+                     cached: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Network half of _tmdb_get: call TMDb (revalidating `cached` if given),
+    normalize and cache the result.
+    """
+    # Revalidate what we have: TMDb answers 304 (empty body) if unchanged
+    etag = cached.get("etag") if cached is not None else None
+    headers = {"If-None-Match": etag} if etag else None
+
+    url = f"{TMDB_BASE}{path}"
+    with INFLIGHT_LIMITER.slot() as acquired:
+        if not acquired:
+            logger.warning("TMDb concurrency limit reached: %s", url)
+            return {"error": "too_many_inflight", "status_code": 503}
+        try:
+            resp = SESSION.get(url, params=params, headers=headers, timeout=timeout)
+        except httpx.RequestError as exc:
+            logger.exception("TMDb network error: %s %s", url, exc)
+            return {"error": "network_error", "status_code": None, "detail": str(exc)}
 
     # Explicit rate limit handling
     if resp.status_code == 429:
@@ -85,24 +208,91 @@ def _tmdb_get(path: str, params: Optional[Dict[str, Any]] = None,
         logger.warning("TMDb rate limited: %s retry-after=%s", url, retry_after)
         return {"error": "rate_limited", "status_code": 429, "retry_after": retry_after}
 
+    # Not modified: keep the cached (already normalized) data, reset its TTL
+    if resp.status_code == 304 and cached is not None:
+        _cache_set(cache_key, cached["data"], etag, ttl)
+        return cached["data"]
+
     try:
         resp.raise_for_status()
-    except requests.HTTPError as exc:
+    except httpx.HTTPStatusError as exc:
         logger.error("TMDb HTTP error %s: %s", resp.status_code, resp.text)
         return {"error": "http_error", "status_code": resp.status_code, "detail": resp.text}
 
     try:
-        data = resp.json()
-    except ValueError:
+        data = orjson.loads(resp.content)
+    except orjson.JSONDecodeError:
         logger.exception("Invalid JSON from TMDb: %s", url)
         return {"error": "invalid_json", "status_code": resp.status_code}
 
+    if normalize:
+        data = NORMALIZERS[normalize](data)
+
     # Save in cache
     if cache_key:
-        cache.set(cache_key, data, CACHE_TIMEOUT)
+        _cache_set(cache_key, data, resp.headers.get("ETag"), ttl)
 
     return data
 
+
+def _serve_cached(cached: Dict[str, Any], path: str, params: Optional[Dict[str, Any]],
+                  cache_key: str, normalize: Optional[str], ttl: int) -> Dict[str, Any]:
+    """Return a cache entry's data, scheduling a background refresh if it is stale."""
+    if time.time() >= cached["fresh_until"]:
+        _schedule_refresh(path, params, cache_key, normalize, ttl)
+    return cached["data"]
+
+
+def _cache_set(cache_key: str, data: Dict[str, Any], etag: Optional[str],
+               ttl: int = CACHE_TIMEOUT) -> None:
+    """Store data with its freshness window and ETag (kept until stale_until)."""
+    now = time.time()
+    cache.set(
+        cache_key,
+        {
+            "data": data,
+            "etag": etag,
+            "fresh_until": now + ttl,
+            "stale_until": now + ttl * STALE_FACTOR,
+        },
+        ttl * STALE_FACTOR,
+    )
+
+
+def _schedule_refresh(path: str, params: Optional[Dict[str, Any]], cache_key: str,
+                      normalize: Optional[str] = None, ttl: int = CACHE_TIMEOUT) -> None:
+    """
+    Start a background refresh of a stale cache entry.
+    The lock key ensures only one refresh per entry is in flight.
+    Refreshes go to Celery only if a worker exists and writes to a cache
+    this process reads; otherwise they run on a thread here.
+    """
+    lock_key = f"{cache_key}:lock"
+    if not cache.add(lock_key, 1, timeout=REFRESH_LOCK_SECONDS):
+        return
+
+    # local import: tasks imports this module
+    from . import tasks
+
+    started = tasks.run_in_background(
+        tasks.refresh_tmdb_path, path, params, cache_key, normalize, ttl,
+        use_celery=tasks.CELERY_AVAILABLE and tasks.SHARED_CACHE,
+    )
+    if not started:
+        cache.delete(lock_key)
+
+
+def refresh_cached(path: str, params: Optional[Dict[str, Any]], cache_key: str,
+                   normalize: Optional[str] = None, ttl: int = CACHE_TIMEOUT) -> None:
+    """
+    Re-fetch a cache entry from TMDb and release its refresh lock.
+    Called by the `refresh_tmdb_path` task.
+    """
+    try:
+        _tmdb_get(path, params, cache_key=cache_key, force=True, normalize=normalize, ttl=ttl)
+    finally:
+        cache.delete(f"{cache_key}:lock")
+
 # ---------------------------------------------------------------------------
 # DTO normalizer
 # ---------------------------------------------------------------------------
@@ -111,17 +301,36 @@ def to_movie_dto(raw: Dict[str, Any]) -> Dict[str, Any]:
     Normalize TMDb movie/TV objects to a stable, compact DTO.
     This insulates frontend from TMDb schema changes.
     """
-    title = raw.get("title") or raw.get("name") or ""
+    get = raw.get  # hoisted: this runs for every result on every page
+    return {
+        "id": get("id"),
+        "title": get("title") or get("name") or "",
+        "poster": get("poster_path"),
+        "backdrop": get("backdrop_path"),
+        "release_date": get("release_date") or get("first_air_date"),
+        "overview": get("overview", ""),
+        "score": get("vote_average", 0.0),
+    }
+
+
+def to_list_dto(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Normalize a paginated TMDb list response (trending, recommendations,
+    search) to {"page", "total_pages", "results": [DTO, ...]}.
+    """
     return {
-        "id": raw.get("id"),
-        "title": title,
-        "poster": raw.get("poster_path"),
-        "backdrop": raw.get("backdrop_path"),
-        "release_date": raw.get("release_date") or raw.get("first_air_date"),
-        "overview": raw.get("overview", ""),
-        "score": raw.get("vote_average", 0.0),
+        "page": payload.get("page", 1),
+        "total_pages": payload.get("total_pages", 1),
+        "results": list(map(to_movie_dto, payload.get("results", []))),
     }
 
+
+# Referenced by name so Celery refresh tasks can pass them as arguments
+NORMALIZERS = {
+    "movie": to_movie_dto,
+    "list": to_list_dto,
+}
+
 # ---------------------------------------------------------------------------
 # Public API functions
 # ---------------------------------------------------------------------------
@@ -129,6 +338,7 @@ def get_trending(
     media_type: str = "movie",
     time_window: str = "week",
     page: int = 1,
+    force_refresh: bool = False,
 ) -> Dict[str, Any]:
     """
     Fetch trending content from TMDb, normalized to DTO.
@@ -136,20 +346,54 @@ def get_trending(
         media_type: "movie" or "tv"
         time_window: "day" or "week"
         page: page number for pagination
+        force_refresh: re-fetch even if cached (used by the Beat refresher)
     """
-    cache_key = f"tmdb:trending:{media_type}:{time_window}:page:{page}"
-    payload = _tmdb_get(
-        f"/trending/{media_type}/{time_window}",
-        params={"page": page},
+    path, params, cache_key = _trending_request(media_type, time_window, page)
+    return _tmdb_get(
+        path,
+        params=params,
         cache_key=cache_key,
+        force=force_refresh,
+        normalize="list",
     )
-    if "error" in payload:
-        return payload
-    return {
-        "page": payload.get("page", 1),
-        "total_pages": payload.get("total_pages", 1),
-        "results": [to_movie_dto(r) for r in payload.get("results", [])],
-    }
+
+
+def _trending_request(media_type: str, time_window: str, page: int):
+    """Return (path, params, cache_key) for one trending page."""
+    return (
+        f"/trending/{media_type}/{time_window}",
+        {"page": page},
+        f"tmdb:trending:{media_type}:{time_window}:page:{page}",
+    )
+
+
+def get_trending_pages(
+    pages: Iterable[int],
+    media_type: str = "movie",
+    time_window: str = "week",
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Fetch several trending pages at once, keyed by page number.
+    Cached pages are read with a single cache.get_many (one MGET on Redis);
+    only the misses go to TMDb, concurrently.
+    """
+    requests_by_page = {page: _trending_request(media_type, time_window, page) for page in pages}
+    cached = cache.get_many([cache_key for _, _, cache_key in requests_by_page.values()])
+
+    results: Dict[int, Dict[str, Any]] = {}
+    missing = []
+    for page, (path, params, cache_key) in requests_by_page.items():
+        if cache_key in cached:
+            results[page] = _serve_cached(cached[cache_key], path, params, cache_key, "list", CACHE_TIMEOUT)
+        else:
+            missing.append(page)
+
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(len(missing), MAX_FETCH_WORKERS)) as executor:
+            fetched = executor.map(lambda p: get_trending(media_type, time_window, p), missing)
+            results.update(zip(missing, fetched))
+
+    return results
 
 
 def get_recommendations(movie_id: int, page: int = 1) -> Dict[str, Any]:
@@ -158,25 +402,18 @@ def get_recommendations(movie_id: int, page: int = 1) -> Dict[str, Any]:
     Results are normalized to DTOs.
     """
     cache_key = f"tmdb:recommendations:{movie_id}:p{page}"
-    payload = _tmdb_get(f"/movie/{movie_id}/recommendations",
-                        params={"page": page}, cache_key=cache_key)
-    if "error" in payload:
-        return payload
-    return {
-        "page": payload.get("page", page),
-        "total_pages": payload.get("total_pages", 1),
-        "results": [to_movie_dto(r) for r in payload.get("results", [])],
-    }
+    return _tmdb_get(f"/movie/{movie_id}/recommendations",
+                     params={"page": page}, cache_key=cache_key, normalize="list")
 
 def get_movie_details(movie_id: int) -> Dict[str, Any]:
     """
     Fetch full details for a specific movie, normalized to DTO.
+    Cached for DETAILS_CACHE_TIMEOUT, so favoriting a popular movie
+    is usually a cache hit.
     """
     cache_key = f"tmdb:movie:{movie_id}:details"
-    payload = _tmdb_get(f"/movie/{movie_id}", cache_key=cache_key)
-    if "error" in payload:
-        return payload
-    return to_movie_dto(payload)
+    return _tmdb_get(f"/movie/{movie_id}", cache_key=cache_key, normalize="movie",
+                     ttl=DETAILS_CACHE_TIMEOUT)
 
 def search_movies(query: str, page: int = 1) -> Dict[str, Any]:
     """
@@ -186,15 +423,9 @@ def search_movies(query: str, page: int = 1) -> Dict[str, Any]:
         return {"error": "missing_query", "status_code": 400}
 
     cache_key = f"tmdb:search:{query.lower().strip()}:p{page}"
-    payload = _tmdb_get(
+    return _tmdb_get(
         "/search/movie",
         params={"query": query, "page": page},
         cache_key=cache_key,
+        normalize="list",
     )
-    if "error" in payload:
-        return payload
-    return {
-        "page": payload.get("page", page),
-        "total_pages": payload.get("total_pages", 1),
-        "results": [to_movie_dto(r) for r in payload.get("results", [])],
-    }
@@ -9,6 +9,7 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
     TrendingMoviesAPIView,
+    TrendingBatchAPIView,
     MovieRecommendationsAPIView,
     MovieSearchAPIView,
     FavoriteMovieViewSet,
@@ -25,6 +26,11 @@ urlpatterns = [
         TrendingMoviesAPIView.as_view(),
         name="movies-trending",
     ),
+    path(
+        "movies/trending/batch/",
+        TrendingBatchAPIView.as_view(),
+        name="movies-trending-batch",
+    ),
     path(
         "movies/<int:movie_id>/recommendations/",
         MovieRecommendationsAPIView.as_view(),
@@ -10,12 +10,14 @@ Responsibilities:
 - Serialize/deserialize data using DRF serializers.
 """
 
-import os
+from functools import wraps
+
+from django.db import transaction
+from django.utils.cache import patch_cache_control
 from rest_framework import status, viewsets, permissions
+from rest_framework.decorators import action
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 from apps.reelmatch.throttles import TMDBRateThrottle
 
 from drf_spectacular.utils import (
@@ -25,28 +27,56 @@ from drf_spectacular.utils import (
 )
 
 from .tmdb import (
+    CACHE_TIMEOUT,
     get_trending,
+    get_trending_pages,
     get_recommendations,
-    get_movie_details,
     search_movies,
 )
 from .models import FavoriteMovie
-from .serializers import FavoriteMovieSerializer, FavoriteMovieCreateSerializer
+from .tasks import hydrate_favorite, hydrate_favorites, run_in_background
+from .serializers import (
+    FavoriteMovieSerializer,
+    FavoriteMovieCreateSerializer,
+    FavoriteMovieBulkCreateSerializer,
+)
+
 
-# Cache duration for TMDb endpoints (default: 60s, can override via env)
-CACHE_SECONDS = int(os.getenv("TMDB_CACHE_SECONDS", 60))
+def public_cache(view_method):
+    """
+    TMDb proxy responses are the same for every user: let browsers/CDNs
+    cache successful ones (no Vary on cookies) for as long as the service
+    layer treats them as fresh. Errors are left uncacheable.
+    """
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        response = view_method(self, request, *args, **kwargs)
+        if response.status_code == 200:
+            patch_cache_control(response, public=True, max_age=CACHE_TIMEOUT)
+        return response
+    return wrapper
+
+
+def _page(request, default: int = 1) -> int:
+    """
+    Parse ?page= as a positive int; missing or malformed values fall back
+    to `default` instead of raising (which would surface as a 500).
+    """
+    value = request.query_params.get("page")
+    return int(value) if value and value.isdecimal() and int(value) > 0 else default
 
 
 class TrendingMoviesAPIView(APIView):
     """
     Public endpoint: returns trending movies from TMDb.
-    Cached for CACHE_SECONDS to reduce external API calls.
+    The service layer caches the normalized payload per page (tmdb.py),
+    so cache hits skip TMDb without Django's full-response caching.
     Supports pagination via ?page=
     """
     permission_classes = [permissions.AllowAny]
     throttle_classes = [TMDBRateThrottle]
 
-    @method_decorator(cache_page(CACHE_SECONDS))
+    @public_cache
     @extend_schema(
         parameters=[
             OpenApiParameter(
@@ -60,7 +90,7 @@ class TrendingMoviesAPIView(APIView):
         description="Return TMDb trending movies (cached, paginated).",
     )
     def get(self, request):
-        page = int(request.query_params.get("page", 1))
+        page = _page(request)
         data = get_trending(page=page)
         if "error" in data:
             return Response(
@@ -70,6 +100,57 @@ class TrendingMoviesAPIView(APIView):
         return Response(data)
 
 
+class TrendingBatchAPIView(APIView):
+    """
+    Public endpoint: returns several trending pages in one request.
+    Example: /movies/trending/batch/?pages=1,2,3
+    Cached pages are read in one batched cache lookup; misses are
+    fetched from TMDb concurrently.
+    """
+    permission_classes = [permissions.AllowAny]
+    throttle_classes = [TMDBRateThrottle]
+
+    MAX_PAGES = 5
+
+    @public_cache
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="pages",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Comma-separated page numbers, e.g. 1,2,3 (max 5)",
+                required=True,
+            )
+        ],
+        responses={200: OpenApiTypes.OBJECT, 400: OpenApiTypes.OBJECT, 502: OpenApiTypes.OBJECT},
+        description="Return several TMDb trending pages at once, keyed by page number.",
+    )
+    def get(self, request):
+        raw = request.query_params.get("pages", "")
+        parts = [p.strip() for p in raw.split(",") if p.strip()]
+        if not parts or not all(p.isdecimal() and int(p) > 0 for p in parts):
+            return Response(
+                {"detail": "pages must be a comma-separated list of positive integers."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        pages = list(dict.fromkeys(int(p) for p in parts))  # dedupe, keep order
+        if len(pages) > self.MAX_PAGES:
+            return Response(
+                {"detail": f"At most {self.MAX_PAGES} pages per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        results = get_trending_pages(pages)
+        errors = [data["error"] for data in results.values() if "error" in data]
+        if errors:
+            return Response(
+                {"detail": "Failed to fetch trending movies", "error": errors[0]},
+                status=status.HTTP_502_BAD_GATEWAY,
+            )
+        return Response({"pages": {str(page): results[page] for page in pages}})
+
+
 @extend_schema(
     parameters=[
         OpenApiParameter(
@@ -92,14 +173,14 @@ class TrendingMoviesAPIView(APIView):
 class MovieRecommendationsAPIView(APIView):
     """
     Public endpoint: returns recommendations for a given TMDb movie ID.
-    Cached for CACHE_SECONDS.
+    Cached per movie/page in the service layer (tmdb.py).
     Supports pagination via ?page=
     """
     permission_classes = [permissions.AllowAny]
 
-    @method_decorator(cache_page(CACHE_SECONDS))
+    @public_cache
     def get(self, request, movie_id: int):
-        page = int(request.query_params.get("page", 1))
+        page = _page(request)
         data = get_recommendations(movie_id, page=page)
         if "error" in data:
             return Response(
@@ -117,6 +198,7 @@ class MovieSearchAPIView(APIView):
     permission_classes = [permissions.AllowAny]
     throttle_classes = [TMDBRateThrottle]
 
+    @public_cache
     @extend_schema(
         parameters=[
             OpenApiParameter(
@@ -138,7 +220,7 @@ class MovieSearchAPIView(APIView):
     )
     def get(self, request):
         query = request.query_params.get("query")
-        page = int(request.query_params.get("page", 1))
+        page = _page(request)
         if not query:
             return Response(
                 {"detail": "Query parameter is required."},
@@ -157,7 +239,8 @@ class FavoriteMovieViewSet(viewsets.ModelViewSet):
     """
     Authenticated endpoint: manages a user's favorite movies.
     - list: return logged-in user's favorites
-    - create: add a new favorite (with TMDb snapshot if available)
+    - create: add a new favorite (TMDb snapshot filled in asynchronously)
+    - bulk: import many favorites at once by TMDb ID
     - destroy: remove a favorite
     """
     permission_classes = [permissions.IsAuthenticated]
@@ -170,11 +253,15 @@ class FavoriteMovieViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """
         Limit results to this user's favorites only.
-        Use `.only()` to fetch minimal fields from DB for performance.
+        `for_list()` fetches just the columns FavoriteMovieSerializer reads
+        (plus FK ids), so no row is refetched for a deferred field; the
+        serializer renders no user fields, so no join is needed.
+        The model has no default ordering, so only `list` pays for a sort.
         """
-        return FavoriteMovie.objects.filter(user=self.request.user).only(
-            "tmdb_id", "title", "poster_path", "added_at"
-        )
+        queryset = FavoriteMovie.objects.for_list(self.request.user)
+        if self.action == "list":
+            queryset = queryset.order_by("-added_at")
+        return queryset
 
     def get_serializer_class(self):
         """
@@ -183,27 +270,54 @@ class FavoriteMovieViewSet(viewsets.ModelViewSet):
         """
         if self.action == "create":
             return FavoriteMovieCreateSerializer
+        if self.action == "bulk":
+            return FavoriteMovieBulkCreateSerializer
         return FavoriteMovieSerializer
 
     def perform_create(self, serializer):
         """
         On create:
-        - Call TMDb service to fetch movie metadata.
-        - If TMDb fails, still save with minimal info (fallback title).
+        - Save immediately with minimal info (fallback title).
+        - Fetch TMDb metadata once the row is committed, in the background
+          (Celery task, or a thread without a worker), so the request never
+          waits on TMDb.
         """
         tmdb_id = serializer.validated_data["tmdb_id"]
-        details = get_movie_details(tmdb_id)
+        favorite = serializer.save(user=self.request.user, title=f"tmdb:{tmdb_id}")
+        transaction.on_commit(lambda: run_in_background(hydrate_favorite, favorite.id))
 
-        if "error" in details:
-            serializer.save(user=self.request.user, title=f"tmdb:{tmdb_id}")
-            return
+    @extend_schema(
+        responses={201: OpenApiTypes.OBJECT},
+        description="Import favorites in bulk from a list of TMDb IDs (duplicates skipped).",
+    )
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        """
+        Bulk import:
+        - Insert all new TMDb IDs in batched INSERTs (source="import").
+        - IDs the user already saved are skipped; the unique constraint
+          plus ignore_conflicts covers concurrent imports.
+        - Titles are placeholders until hydrate_favorites fetches the
+          movies from TMDb, after the rows commit.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        tmdb_ids = set(serializer.validated_data["tmdb_ids"])
 
-        serializer.save(
-            user=self.request.user,
-            title=details.get("title") or details.get("name") or "",
-            poster_path=details.get("poster_path", ""),
-            overview=details.get("overview", ""),
+        existing = set(
+            FavoriteMovie.objects.filter(user=request.user, tmdb_id__in=tmdb_ids)
+            .values_list("tmdb_id", flat=True)
         )
+        objs = [
+            FavoriteMovie(user=request.user, tmdb_id=tmdb_id, title=f"tmdb:{tmdb_id}", source="import")
+            for tmdb_id in sorted(tmdb_ids - existing)
+        ]
+        FavoriteMovie.objects.bulk_create(objs, ignore_conflicts=True, batch_size=500)
+        if objs:
+            user_id, new_ids = request.user.pk, [obj.tmdb_id for obj in objs]
+            transaction.on_commit(lambda: run_in_background(hydrate_favorites, user_id, new_ids))
+
+        return Response({"created": len(objs)}, status=status.HTTP_201_CREATED)
 
     def destroy(self, request, *args, **kwargs):
         """
@@ -1,27 +1,47 @@
 # apps/reelmatch/views_movies.py
+import json
+from types import MappingProxyType
+
+from django.http import HttpResponse
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import permissions, status
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiTypes
 
 # Mocked movie data for testing
-MOCK_TRENDING = [
+MOCK_TRENDING = (
     {"id": 101, "title": "The Matrix"},
     {"id": 102, "title": "Inception"},
     {"id": 103, "title": "Interstellar"},
-]
+)
 
-MOCK_RECOMMENDATIONS = {
+MOCK_RECOMMENDATIONS = MappingProxyType({
     101: [{"id": 201, "title": "The Matrix Reloaded"}],
     202: [{"id": 2021, "title": "The Dark Knight"}],
     550: [{"id": 5501, "title": "Fight Club Sequel"}],
-}
+})
 
-MOCK_DETAILS = {
+MOCK_DETAILS = MappingProxyType({
     123: {"id": 123, "title": "Titanic", "year": 1997},
     456: {"id": 456, "title": "Avatar", "year": 2009},
     789: {"id": 789, "title": "Gladiator", "year": 2000},
-}
+})
+
+
+# The mock data never changes, so encode each response body once at import
+# and serve the bytes directly instead of rendering JSON on every request.
+def _json_bytes(data):
+    return json.dumps(data).encode()
+
+
+TRENDING_BODY = _json_bytes({"results": MOCK_TRENDING})
+EMPTY_RECOMMENDATIONS_BODY = _json_bytes({"results": []})
+RECOMMENDATIONS_BODIES = MappingProxyType(
+    {movie_id: _json_bytes({"results": recs}) for movie_id, recs in MOCK_RECOMMENDATIONS.items()}
+)
+DETAILS_BODIES = MappingProxyType(
+    {movie_id: _json_bytes(details) for movie_id, details in MOCK_DETAILS.items()}
+)
 
 
 class TrendingMoviesAPIView(APIView):
@@ -32,7 +52,7 @@ class TrendingMoviesAPIView(APIView):
         description="Return a mocked list of trending movies."
     )
     def get(self, request):
-        return Response({"results": MOCK_TRENDING})
+        return HttpResponse(TRENDING_BODY, content_type="application/json")
 
 
 @extend_schema(
@@ -52,8 +72,8 @@ class MovieRecommendationsAPIView(APIView):
     permission_classes = [permissions.AllowAny]
 
     def get(self, request, movie_id: int):
-        data = MOCK_RECOMMENDATIONS.get(movie_id, [])
-        return Response({"results": data})
+        body = RECOMMENDATIONS_BODIES.get(movie_id, EMPTY_RECOMMENDATIONS_BODY)
+        return HttpResponse(body, content_type="application/json")
 
 
 @extend_schema(
@@ -73,10 +93,10 @@ class MovieDetailsAPIView(APIView):
     permission_classes = [permissions.AllowAny]
 
     def get(self, request, movie_id: int):
-        data = MOCK_DETAILS.get(movie_id)
-        if not data:
+        body = DETAILS_BODIES.get(movie_id)
+        if not body:
             return Response(
                 {"detail": "Movie not found."},
                 status=status.HTTP_404_NOT_FOUND,
             )
-        return Response(data)
+        return HttpResponse(body, content_type="application/json")
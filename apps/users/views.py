@@ -2,11 +2,16 @@ from rest_framework import generics, permissions
 from .models import User
 from .serializers import UserSerializer
 
+# Load only the columns UserSerializer renders (skips password, last_login, ...)
+USER_FIELDS = UserSerializer.Meta.fields
+
+
 class UserListView(generics.ListAPIView):
     """
     Get a list of all users (only for authenticated users).
+    Ordered by ID so pagination is stable.
     """
-    queryset = User.objects.all()
+    queryset = User.objects.only(*USER_FIELDS).order_by("id")
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -14,6 +19,6 @@ class UserDetailView(generics.RetrieveAPIView):
     """
     Get details of a single user by ID.
     """
-    queryset = User.objects.all()
+    queryset = User.objects.only(*USER_FIELDS)
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
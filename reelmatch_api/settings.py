@@ -1,19 +1,20 @@
 """ Django settings for reelmatch_api project. """
 
-import os
+import environ
+import orjson
 import dj_database_url
 from pathlib import Path
 from datetime import timedelta
-from dotenv import load_dotenv
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-# Load environment variables
-load_dotenv(BASE_DIR / ".env")
+# Load environment variables (.env is parsed once; env.* does typed lookups)
+env = environ.Env()
+environ.Env.read_env(BASE_DIR / ".env")
 
-SECRET_KEY = os.getenv("DJANGO_SECRET_KEY", "insecure-dev-key")
-DEBUG = os.getenv("DJANGO_DEBUG", "True") == "True"
-ALLOWED_HOSTS = os.getenv("DJANGO_ALLOWED_HOSTS", "*").split(",")
+SECRET_KEY = env("DJANGO_SECRET_KEY", default="insecure-dev-key")
+DEBUG = env.bool("DJANGO_DEBUG", default=True)
+ALLOWED_HOSTS = env.list("DJANGO_ALLOWED_HOSTS", default=["*"])
 
 # -------------------------------------------------------------------
 # Applications
@@ -42,7 +43,9 @@ INSTALLED_APPS = [
 # Custom user model
 AUTH_USER_MODEL = "users.User"
 
-MIDDLEWARE = [
+# Sessions, CSRF and messages are only needed by /admin/ (the API is JWT-only),
+# but the admin is still routed so they stay in the chain.
+MIDDLEWARE = (
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -50,7 +53,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-]
+)
 
 ROOT_URLCONF = "reelmatch_api.urls"
 
@@ -76,28 +79,59 @@ WSGI_APPLICATION = "reelmatch_api.wsgi.application"
 # -------------------------------------------------------------------
 DATABASES = {
     "default": dj_database_url.config(
-        default=os.getenv("DATABASE_URL"),
+        default=env("DATABASE_URL", default=None),
         conn_max_age=600,
+        # Ping reused connections once per request so a dropped socket is
+        # replaced instead of failing the first query
+        conn_health_checks=True,
         ssl_require=True,
     )
 }
 
 # -------------------------------------------------------------------
-# Caching (LocMemCache instead of Redis)
-# -------------------------------------------------------------------
-CACHES = {
-    "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-        "LOCATION": "unique-reelmatch-cache",
+# Caching (Redis when REDIS_URL is set, else LocMemCache)
+# LocMem is per process: web, worker and beat each get their own, so
+# anything Celery writes is invisible to web without REDIS_URL.
+# -------------------------------------------------------------------
+REDIS_URL = env("REDIS_URL", default=None)
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django_redis.cache.RedisCache",
+            "LOCATION": REDIS_URL,
+            "OPTIONS": {
+                "CLIENT_CLASS": "django_redis.client.DefaultClient",
+                # C parser for RESP replies (requires `hiredis`)
+                "PARSER_CLASS": "redis.connection._HiredisParser",
+                # Wait for a free connection instead of erroring at the cap
+                "CONNECTION_POOL_CLASS": "redis.BlockingConnectionPool",
+                "CONNECTION_POOL_KWARGS": {"max_connections": 100, "timeout": 20},
+            },
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "unique-reelmatch-cache",
+        }
     }
-}
 
 # -------------------------------------------------------------------
 # REST Framework
 # -------------------------------------------------------------------
 REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
-    "PAGE_SIZE": int(os.getenv("API_PAGE_SIZE", 20)),
+    "PAGE_SIZE": env.int("API_PAGE_SIZE", default=20),
+    # orjson (C) instead of stdlib json for response encoding
+    "DEFAULT_RENDERER_CLASSES": (
+        "drf_orjson_renderer.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    # DRF keys ListField/ListSerializer errors by int index; orjson only
+    # accepts str keys unless told otherwise
+    "ORJSON_RENDERER_OPTIONS": (orjson.OPT_NON_STR_KEYS,),
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
@@ -117,8 +151,8 @@ REST_FRAMEWORK = {
 # JWT
 # -------------------------------------------------------------------
 SIMPLE_JWT = {
-    "ACCESS_TOKEN_LIFETIME": timedelta(minutes=int(os.getenv("JWT_ACCESS_MINUTES", 60))),
-    "REFRESH_TOKEN_LIFETIME": timedelta(days=int(os.getenv("JWT_REFRESH_DAYS", 1))),
+    "ACCESS_TOKEN_LIFETIME": timedelta(minutes=env.int("JWT_ACCESS_MINUTES", default=60)),
+    "REFRESH_TOKEN_LIFETIME": timedelta(days=env.int("JWT_REFRESH_DAYS", default=1)),
     "ROTATE_REFRESH_TOKENS": True,
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
@@ -128,9 +162,18 @@ SIMPLE_JWT = {
 # -------------------------------------------------------------------
 # Since Redis is unavailable on Render, Celery will not work unless you connect
 # to a managed Redis (like Upstash). For now, disable Redis config.
-CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "memory://")
+CELERY_BROKER_URL = env("CELERY_BROKER_URL", default="memory://")
 CELERY_RESULT_BACKEND = CELERY_BROKER_URL
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
+CELERY_BEAT_SCHEDULE = {}
+if REDIS_URL:
+    # Keep trending pages warm; runs just under TMDB_CACHE_SECONDS (default 60s).
+    # Only registered with a shared cache: with LocMem the worker would
+    # warm its own copy, which web never reads.
+    CELERY_BEAT_SCHEDULE["refresh-trending"] = {
+        "task": "apps.reelmatch.tasks.refresh_trending",
+        "schedule": env.float("TMDB_TRENDING_REFRESH_SECONDS", default=45.0),
+    }
 
 # -------------------------------------------------------------------
 # Logging
@@ -147,7 +190,7 @@ LOGGING = {
     "handlers": {
         "console": {"class": "logging.StreamHandler", "formatter": "json"},
     },
-    "root": {"handlers": ["console"], "level": os.getenv("LOG_LEVEL", "INFO")},
+    "root": {"handlers": ["console"], "level": env("LOG_LEVEL", default="INFO")},
 }
 
 # -------------------------------------------------------------------